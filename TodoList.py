@@ -1,11 +1,49 @@
-import json
+import atexit
+import bisect
 import os
-from datetime import datetime
+import re
+import sqlite3
+import sys
+from datetime import date
+from operator import attrgetter
 
-# Файл для хранения событий
+# Быстрый JSON-кодек — нужен только для разовой миграции старого events.json:
+# orjson, затем ujson, затем стандартный json (loads у всех одинаковый)
+try:
+    import orjson as _json
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+
+# База данных для хранения событий
+DB_NAME = 'events.db'
+
+# Старый JSON-файл: при первом запуске его содержимое переносится в базу
 FILE_NAME = 'events.json'
 
+# Шаблон даты YYYY-MM-DD: отсеивает заведомо неверный ввод в C-коде regex,
+# не доходя до создания объекта date и перехвата ValueError
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+
+# Меню собрано в одну строку: один вывод за итерацию вместо девяти print
+_MENU = """
+=== Ежедневник ===
+1. Показать все события
+2. Добавить событие
+3. Редактировать событие
+4. Удалить событие
+5. Отметить событие как выполненное
+6. Отсортировать события по дате
+0. Выход
+"""
+
 class Event:
+    # Фиксированный набор атрибутов вместо __dict__ — меньше памяти
+    # на каждый объект и быстрее доступ к атрибутам
+    __slots__ = ('id', 'title', 'importance', 'date', 'completed')
+
     # Конструктор класса события
     def __init__(self, event_id, title, importance, date, completed=False):
         self.id = event_id           # ID события
@@ -14,62 +52,99 @@ class Event:
         self.date = date             # Дата события (в формате 'YYYY-MM-DD')
         self.completed = completed   # Статус выполнения (по умолчанию False)
 
-    # Преобразование объекта Event в словарь для хранения в JSON
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'importance': self.importance,
-            'date': self.date,
-            'completed': self.completed
-        }
-
-    # Статический метод для создания объекта Event из словаря
-    @staticmethod
-    def from_dict(data):
-        return Event(
-            data['id'],
-            data['title'],
-            data['importance'],
-            data['date'],
-            data.get('completed', False)  # Если ключа 'completed' нет, значение по умолчанию False
-        )
-
 
 class Diary:
     # Конструктор класса для управления событиями
     def __init__(self):
-        self.events = []  # Список всех событий
-        self.load_events()  # Загрузка событий из файла
+        self._events = None  # Список событий; база читается лениво, при первом обращении
+        self._by_id = {}  # Индекс ID -> Event для поиска за O(1)
+        self._max_id = 0  # Кэш максимального ID для генерации новых
+        # isolation_level=None — автокоммит: каждая мутация сразу в базе.
+        # WAL и synchronous=NORMAL делают одиночные записи дешёвыми
+        self._conn = sqlite3.connect(DB_NAME, isolation_level=None)
+        self._conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "CREATE TABLE IF NOT EXISTS events("
+            "id INTEGER PRIMARY KEY, title TEXT, importance TEXT, "
+            "date TEXT, completed INTEGER)"
+        )
+        self._migrate_legacy_json()
 
-    # Метод загрузки событий из файла JSON
-    def load_events(self):
-        if os.path.exists(FILE_NAME):  # Проверяем наличие файла
-            with open(FILE_NAME, 'r', encoding='utf-8') as f:
-                data = json.load(f)  # Чтение данных из файла
-                self.events = [Event.from_dict(event) for event in data]  # Преобразуем данные в объекты Event
-        else:
-            self.events = []  # Если файл не найден, список событий пуст
+    # Разовый перенос данных из старого events.json в базу
+    def _migrate_legacy_json(self):
+        if not os.path.exists(FILE_NAME):
+            return
+        with open(FILE_NAME, 'rb') as f:
+            data = _json.loads(f.read())
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO events VALUES(?,?,?,?,?)",
+            [(d['id'], d['title'], d['importance'], d['date'],
+              int(d.get('completed', False))) for d in data]
+        )
+        os.replace(FILE_NAME, FILE_NAME + '.bak')  # Файл больше не источник данных
+
+    # Закрытие соединения с базой
+    def close(self):
+        self._conn.close()
+
+    # Список всех событий: чтение из базы откладывается до первого обращения,
+    # так что запуск программы не платит за загрузку всех строк
+    @property
+    def events(self):
+        if self._events is None:
+            self.load_events()
+        return self._events
 
-    # Метод сохранения всех событий в файл JSON
-    def save_events(self):
-        with open(FILE_NAME, 'w', encoding='utf-8') as f:
-            json.dump([event.to_dict() for event in self.events], f, ensure_ascii=False, indent=4)  # Сохранение в JSON
+    # Гарантия загрузки для методов, работающих с индексами напрямую
+    def _ensure_loaded(self):
+        if self._events is None:
+            self.load_events()
+
+    # Сдвиг позиций в индексе id -> позиция после вставки (+1) или удаления (-1)
+    def _shift_index(self, start, delta):
+        for eid, pos in self._index.items():
+            if pos >= start:
+                self._index[eid] = pos + delta
+
+    # Метод загрузки событий из базы
+    def load_events(self):
+        rows = self._conn.execute(
+            "SELECT id, title, importance, date, completed FROM events ORDER BY date, id"
+        ).fetchall()
+        # Важность — одна из трёх фиксированных строк; интернирование
+        # схлопывает дубликаты в один общий объект.
+        # ORDER BY уже дал сортировку по дате — инвариант списка;
+        # параллельный список дат нужен для бинарного поиска при вставке
+        self._events = [Event(eid, title, sys.intern(importance), event_date, bool(completed))
+                        for eid, title, importance, event_date, completed in rows]
+        self._dates = [event.date for event in self._events]
+        # Перестраиваем индексы и кэш максимального ID
+        self._by_id = {event.id: event for event in self._events}
+        self._index = {event.id: i for i, event in enumerate(self._events)}
+        self._max_id = max(self._by_id, default=0)
 
     # Метод для добавления нового события
     def add_event(self, title, importance, date):
+        self._ensure_loaded()
         event_id = self._generate_id()  # Генерация уникального ID
         new_event = Event(event_id, title, importance, date)  # Создание нового события
-        self.events.append(new_event)  # Добавление события в список
-        self.save_events()  # Сохранение изменений в файл
+        # Вставка по бинарному поиску сохраняет сортировку по дате
+        idx = bisect.bisect_right(self._dates, date)
+        self._dates.insert(idx, date)
+        self.events.insert(idx, new_event)
+        self._shift_index(idx, +1)
+        self._index[event_id] = idx
+        self._by_id[event_id] = new_event  # Обновление индекса
+        self._max_id = event_id  # Обновление кэша максимального ID
+        # Одна вставленная строка — объём записи не зависит от размера дневника
+        self._conn.execute("INSERT INTO events VALUES(?,?,?,?,?)",
+                           (event_id, title, importance, date, 0))
         print("Событие добавлено успешно.")
 
     # Генерация уникального ID для события
     def _generate_id(self):
-        if not self.events:
-            return 1  # Если список пуст, начинаем с ID 1
-        else:
-            return max(event.id for event in self.events) + 1  # Возвращаем следующий ID
+        return self._max_id + 1  # Следующий ID без сканирования списка
 
     # Метод для редактирования существующего события
     def edit_event(self, event_id, title=None, importance=None, date=None):
@@ -79,9 +154,20 @@ class Diary:
                 event.title = title  # Изменение названия
             if importance:
                 event.importance = importance  # Изменение важности
-            if date:
+            if date and date != event.date:
+                # Смена даты: переставляем событие, сохраняя сортировку
+                i = self._index.pop(event_id)
+                self.events.pop(i)
+                self._dates.pop(i)
+                self._shift_index(i, -1)
                 event.date = date  # Изменение даты
-            self.save_events()  # Сохранение изменений
+                idx = bisect.bisect_right(self._dates, date)
+                self._dates.insert(idx, date)
+                self.events.insert(idx, event)
+                self._shift_index(idx, +1)
+                self._index[event_id] = idx
+            self._conn.execute("UPDATE events SET title=?, importance=?, date=? WHERE id=?",
+                               (event.title, event.importance, event.date, event_id))
             print("Событие обновлено успешно.")
         else:
             print("Событие не найдено.")
@@ -90,8 +176,12 @@ class Diary:
     def delete_event(self, event_id):
         event = self.get_event_by_id(event_id)  # Получение события по ID
         if event:
-            self.events.remove(event)  # Удаление события из списка
-            self.save_events()  # Сохранение изменений
+            i = self._index.pop(event_id)  # Позиция известна без сканирования списка
+            self.events.pop(i)  # Удаление события из списка
+            self._dates.pop(i)  # ...и из параллельного списка дат
+            self._shift_index(i, -1)
+            del self._by_id[event.id]  # Удаление из индекса
+            self._conn.execute("DELETE FROM events WHERE id=?", (event_id,))
             print("Событие удалено успешно.")
         else:
             print("Событие не найдено.")
@@ -101,65 +191,66 @@ class Diary:
         event = self.get_event_by_id(event_id)  # Получение события по ID
         if event:
             event.completed = True  # Помечаем событие как выполненное
-            self.save_events()  # Сохранение изменений
+            self._conn.execute("UPDATE events SET completed=1 WHERE id=?", (event_id,))
             print("Событие отмечено как выполненное.")
         else:
             print("Событие не найдено.")
 
     # Метод для сортировки событий по дате
     def sort_events_by_date(self):
-        self.events.sort(key=lambda event: event.date)  # Сортировка по дате
-        self.save_events()  # Сохранение изменений
+        # C-реализованный attrgetter быстрее lambda; при уже отсортированном
+        # списке (инвариант вставки) Timsort отрабатывает за O(n)
+        self.events.sort(key=attrgetter('date'))
+        self._dates = [event.date for event in self.events]
+        self._index = {event.id: i for i, event in enumerate(self.events)}
+        # В базу ничего не пишем: порядок задаёт ORDER BY при загрузке
         print("События отсортированы по дате.")
 
     # Метод для получения события по его ID
     def get_event_by_id(self, event_id):
-        for event in self.events:
-            if event.id == event_id:
-                return event
-        return None
+        self._ensure_loaded()
+        return self._by_id.get(event_id)  # Поиск по индексу за O(1)
 
     # Метод для отображения всех событий
     def display_events(self):
         if not self.events:
             print("Событий нет.")  # Если список событий пуст
             return
-        print("\nСписок событий:")
-        # Заголовки столбцов с выравниванием
-        print("{:<5} {:<30} {:<10} {:<12} {:<12}".format("ID", "Название", "Важность", "Дата", "Статус"))
-        print("-" * 70)
+        # Собираем весь вывод в один буфер: f-строки быстрее str.format,
+        # а единственный write избавляет от системного вызова на каждую строку
+        lines = [
+            "\nСписок событий:",
+            f"{'ID':<5} {'Название':<30} {'Важность':<10} {'Дата':<12} {'Статус':<12}",
+            "-" * 70,
+        ]
         for event in self.events:
             status = "Выполнено" if event.completed else "Не выполнено"  # Статус события
-            # Форматированный вывод каждого события
-            print("{:<5} {:<30} {:<10} {:<12} {:<12}".format(
-                event.id, event.title[:30], event.importance, event.date, status))
-        print()
+            lines.append(f"{event.id:<5} {event.title[:30]:<30} {event.importance:<10} {event.date:<12} {status:<12}")
+        lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 # Функция для запроса даты с проверкой корректности формата
 def input_date(prompt):
     while True:
         date_str = input(prompt)  # Запрос даты от пользователя
-        try:
-            datetime.strptime(date_str, '%Y-%m-%d')  # Проверка формата даты
-            return date_str
-        except ValueError:
-            print("Неверный формат даты. Используйте YYYY-MM-DD.")  # Сообщение об ошибке
+        m = _DATE_RE.match(date_str)  # Быстрая проверка формата без исключений
+        if m:
+            try:
+                date(int(m[1]), int(m[2]), int(m[3]))  # Проверка диапазонов (месяц, день)
+                return date_str
+            except ValueError:
+                pass
+        print("Неверный формат даты. Используйте YYYY-MM-DD.")  # Сообщение об ошибке
 
 # Главная функция для работы с ежедневником
 def main():
     diary = Diary()  # Создание экземпляра дневника
+    atexit.register(diary.close)  # Закрытие базы при любом выходе
 
     while True:
         # Меню для выбора действия
-        print("\n=== Ежедневник ===")
-        print("1. Показать все события")
-        print("2. Добавить событие")
-        print("3. Редактировать событие")
-        print("4. Удалить событие")
-        print("5. Отметить событие как выполненное")
-        print("6. Отсортировать события по дате")
-        print("0. Выход")
+        sys.stdout.write(_MENU)
 
         choice = input("Выберите действие: ")  # Запрос действия от пользователя
 